@@ -3,15 +3,28 @@
 
 from __future__ import annotations
 
+import argparse
+import functools
+import hashlib
 import html
+import importlib.util
+import itertools
 import json
+import os
 import posixpath
 import re
 import shutil
+import signal
+import socket
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -22,14 +35,42 @@ TEMPLATE = CABINET_DIR / "cabinet-template.html"
 INDEX_TEMPLATE = CABINET_DIR / "index-template.html"
 DOC_ID_MAP = CABINET_DIR / "doc-id-map.json"
 DOC_ID_MAP_VERSION = 1
+BUILD_CACHE = CABINET_DIR / ".build-cache.json"
+BUILD_CACHE_VERSION = 1
 DOC_ID_RE = re.compile(r"^[A-Z0-9]+-[0-9]{3,}$")
 WIKILINK_RE = re.compile(r"\[\[([^\]\n]+)\]\]")
 MD_LINK_RE = re.compile(r"(?<!!)\[([^\]\n]+)\]\(([^)\n]+)\)")
 FENCE_RE = re.compile(r"^\s*(```|~~~)")
 INLINE_CODE_RE = re.compile(r"(`[^`\n]*`)")
+H1_RE = re.compile(r"^#\s+(.+)$")
+SLUG_SPLIT_RE = re.compile(r"[^a-zA-Z0-9]+")
+EXTERNAL_HREF_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+# Anything that could be an ATX heading or a setext underline. Over-matching
+# (say, a horizontal rule) only costs an empty TOC, never a missing one.
+HEADING_HINT_RE = re.compile(r"^ {0,3}(#{1,6}(\s|$)|[=-]+[ \t]*$)", re.MULTILINE)
 BACKLINKS_MARKER = "<!-- BACKLINKS -->"
+# Static Pandoc options, in the shape shared by `pandoc server` requests and
+# `--defaults` files. The TOC and MathML are enabled per doc, see
+# doc_pandoc_options.
+PANDOC_OPTIONS: dict[str, object] = {
+    # Some dossier docs intentionally omit a blank line before list items.
+    # Enable this extension so bullets render as lists instead of inline text.
+    "from": "markdown+lists_without_preceding_blankline",
+    "to": "html5",
+    "standalone": True,
+    "wrap": "none",
+    "toc-depth": 3,
+}
+PANDOC_SERVER_STARTUP_TIMEOUT = 10.0
+PANDOC_REQUEST_TIMEOUT = 120
+WATCH_DEBOUNCE = 0.2
+# The server only listens on localhost; never route its requests via a proxy.
+LOCAL_OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}))
 
 DOSSIER_ROOTS = [REPO_ROOT / "dossiers"]
+REPO_PREFIX_LEN = len(str(REPO_ROOT)) + 1
+# "../" repeated per page depth; slugs rarely nest deeper than a few levels.
+ROOT_PREFIXES = tuple("../" * depth for depth in range(16))
 
 DISPLAY_NAMES: dict[str, str] = {
     "wonton-soup": "Wonton Soup",
@@ -57,7 +98,7 @@ def allocation_sort_key(entry: dict[str, str]) -> str:
 
 
 def find_docs() -> dict[str, list[dict[str, str]]]:
-    """Return {dossier_slug: [{path, title, slug, category}, ...]}."""
+    """Return {dossier_slug: [{path, title, slug, category}, ...]} in drawer order."""
     dossiers: dict[str, list[dict[str, str]]] = {}
     for root in DOSSIER_ROOTS:
         if not root.is_dir():
@@ -65,14 +106,13 @@ def find_docs() -> dict[str, list[dict[str, str]]]:
         for docs_dir in sorted(root.glob("*/docs")):
             dossier = docs_dir.parent.name
             entries = []
-            for md in sorted(docs_dir.rglob("*.md")):
-                title = extract_title(md)
-                rel = md.relative_to(docs_dir)
-                slug = rel.with_suffix("").as_posix()
+            for rel, path, mtime_ns in scan_markdown(str(docs_dir)):
+                title = extract_title(Path(path), mtime_ns)
+                slug = rel[:-3]
                 # Top-level subdirectory becomes category; docs at root are uncategorized.
-                category = rel.parts[0] if len(rel.parts) > 1 else ""
+                category = slug.split("/", 1)[0] if "/" in slug else ""
                 entries.append({
-                    "path": str(md),
+                    "path": path,
                     "docs_root": str(docs_dir),
                     "dossier": dossier,
                     "title": title,
@@ -80,15 +120,51 @@ def find_docs() -> dict[str, list[dict[str, str]]]:
                     "category": category,
                 })
             if entries:
+                # Sort once here; later passes rely on this drawer order.
+                entries.sort(key=entry_sort_key)
                 dossiers[dossier] = entries
     return dossiers
 
 
-def extract_title(md_path: Path) -> str:
-    """Extract title: first H1 within the first 5 lines, else first non-empty line."""
-    lines = md_path.read_text(encoding="utf-8").splitlines()
-    for line in lines[:5]:
-        m = re.match(r"^#\s+(.+)$", line)
+def scan_markdown(docs_dir: str) -> list[tuple[str, str, int]]:
+    """Return (posix relative path, path, mtime_ns) for .md files under docs_dir.
+
+    A plain os.scandir walk: DirEntry carries the file type from the directory
+    listing, so only the markdown files themselves are stat'ed, once each.
+    Directory symlinks are not descended into, matching Path.rglob.
+    """
+    prefix_len = len(docs_dir) + 1
+    found: list[tuple[str, str, int]] = []
+    stack = [docs_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for dir_entry in it:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    stack.append(dir_entry.path)
+                elif dir_entry.name.endswith(".md") and dir_entry.is_file():
+                    rel = dir_entry.path[prefix_len:].replace(os.sep, "/")
+                    found.append((rel, dir_entry.path, dir_entry.stat().st_mtime_ns))
+    return found
+
+
+def extract_title(md_path: Path, mtime_ns: int | None = None) -> str:
+    """Extract title: first H1 within the first 5 lines, else first non-empty line.
+
+    Pass mtime_ns when the caller already has it to avoid another stat.
+    """
+    if mtime_ns is None:
+        mtime_ns = md_path.stat().st_mtime_ns
+    return extract_title_cached(str(md_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=None)
+def extract_title_cached(path: str, mtime_ns: int) -> str:
+    # mtime_ns only keys the cache, so an edited file is read again.
+    md_path = Path(path)
+    with md_path.open(encoding="utf-8") as f:
+        lines = list(itertools.islice(f, 5))
+    for line in lines:
+        m = H1_RE.match(line)
         if m:
             return m.group(1).strip()
     for line in lines[:3]:
@@ -98,11 +174,12 @@ def extract_title(md_path: Path) -> str:
     return md_path.stem.replace("-", " ").replace("_", " ").title()
 
 
+@functools.lru_cache(maxsize=None)
 def dossier_code(dossier: str) -> str:
     if dossier in DOSSIER_CODES:
         return DOSSIER_CODES[dossier]
 
-    parts = [p for p in re.split(r"[^a-zA-Z0-9]+", dossier) if p]
+    parts = [p for p in SLUG_SPLIT_RE.split(dossier) if p]
     initials = "".join(p[0] for p in parts[:3]).upper()
     return initials or dossier[:2].upper()
 
@@ -256,6 +333,8 @@ def assign_doc_ids(
 
     for dossier, entries in sorted(dossiers.items()):
         code = dossier_code(dossier)
+        if DOC_ID_RE.match(f"{code}-001") is None:
+            raise ValueError(f"{dossier}: code '{code}' cannot form valid doc ids")
         section = dossiers_registry.get(dossier)
         if section is None:
             section = {"code": code, "next_counter": 1, "docs": {}}
@@ -433,7 +512,7 @@ def resolve_wikilink_target(
 
 
 def is_external_href(href: str) -> bool:
-    return bool(re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", href)) or href.startswith("//")
+    return bool(EXTERNAL_HREF_RE.match(href)) or href.startswith("//")
 
 
 def parse_markdown_href(raw_href: str) -> str:
@@ -646,6 +725,12 @@ def build_backlink_graph(
     return deduped
 
 
+@functools.lru_cache(maxsize=None)
+def escape_category(category: str) -> str:
+    # Categories are a handful of directory names; escape each one once.
+    return html.escape(category)
+
+
 def render_backlinks_html(
     entry: dict[str, str], backlinks: dict[tuple[str, str], list[dict[str, str]]]
 ) -> str:
@@ -661,13 +746,14 @@ def render_backlinks_html(
     items = []
     for source in sources:
         href = relative_doc_href(entry, source)
-        doc_id = html.escape(source["doc_id"])
+        # Doc ids always match DOC_ID_RE (checked on load and allocation).
+        doc_id = source["doc_id"]
         title = html.escape(source["title"])
         category = source["category"]
         category_html = ""
         if category:
             category_html = (
-                f'<span class="doc-backlinks-category">{html.escape(category)}</span>'
+                f'<span class="doc-backlinks-category">{escape_category(category)}</span>'
             )
         items.append(
             f'<li class="doc-backlinks-item">'
@@ -693,160 +779,536 @@ def output_dir_for(dossier: str, slug: str) -> Path:
     return CABINET_DIR / dossier / slug
 
 
-def render_doc(
-    entry: dict[str, str],
-    built_at: str,
-    backlinks: dict[tuple[str, str], list[dict[str, str]]],
-) -> None:
-    """Render a single markdown doc to HTML via Pandoc."""
+def repo_relative_path(entry: dict[str, str]) -> str:
+    # Doc paths are discovered under DOSSIER_ROOTS, which live in REPO_ROOT, so
+    # slicing the prefix off is equivalent to Path.relative_to without the Path.
+    return entry["path"][REPO_PREFIX_LEN:].replace(os.sep, "/")
+
+
+def doc_metadata(entry: dict[str, str], built_at: str) -> dict[str, str]:
+    """Return the template metadata for a doc, as passed to Pandoc."""
     dossier = entry["dossier"]
-    md_path = Path(entry["path"])
     slug = entry["slug"]
-    out_dir = output_dir_for(dossier, slug)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_file = out_dir / "index.html"
 
     # Depth from site root: cabinet/<dossier>/<slug-parts>/index.html
-    depth = 2 + len(Path(slug).parts)
-    root_prefix = "../" * depth
+    depth = 3 + slug.count("/")
+    if depth < len(ROOT_PREFIXES):
+        root_prefix = ROOT_PREFIXES[depth]
+    else:
+        root_prefix = "../" * depth
 
     dossier_display = DISPLAY_NAMES.get(dossier, dossier.replace("-", " ").title())
-    source_path = md_path.relative_to(REPO_ROOT).as_posix()
+    source_path = repo_relative_path(entry)
+
+    metadata = {
+        "lang": "en",
+        "pagetitle": f"{entry['title']} | SPECTER Labs",
+        "slug": slug,
+        "doc_id": entry["doc_id"],
+        "dossier": dossier_display,
+        "root_prefix": root_prefix,
+        "source_path": source_path,
+        "built_at": built_at,
+    }
+    if entry["category"]:
+        metadata["category"] = entry["category"]
+    return metadata
+
+
+def pandoc_server_convert(
+    server: dict[str, object], payload: dict[str, object]
+) -> bytes:
+    """POST a conversion request to a running `pandoc server` and return its output."""
+    request = urllib.request.Request(
+        str(server["url"]),
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json", "Accept": "text/plain"},
+    )
+    try:
+        with LOCAL_OPENER.open(request, timeout=PANDOC_REQUEST_TIMEOUT) as response:
+            return response.read()
+    except urllib.error.HTTPError as exc:
+        raise ValueError(exc.read().decode("utf-8", "replace").strip()) from exc
 
-    markdown = entry.get("render_markdown")
-    if not isinstance(markdown, str):
-        raise ValueError(f"missing transformed markdown for {entry['path']}")
 
+def stop_pandoc_server(server: dict[str, object]) -> None:
+    process = server["process"]
+    if not isinstance(process, subprocess.Popen):
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def start_pandoc_server() -> dict[str, object] | None:
+    """Launch one `pandoc server` for the whole build, or return None if unavailable.
+
+    `pandoc server --port 0` does not report the port it bound, so a free port
+    is reserved up front. The server is probed with a trivial conversion since
+    some Pandoc builds start the server but cannot serve requests.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    try:
+        process = subprocess.Popen(
+            [
+                "pandoc", "server",
+                "--port", str(port),
+                "--timeout", str(PANDOC_REQUEST_TIMEOUT),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    server: dict[str, object] = {
+        "kind": "server",
+        "process": process,
+        "url": f"http://127.0.0.1:{port}/",
+        # Server mode cannot read templates from disk; requests carry the text.
+        "template": TEMPLATE.read_text(encoding="utf-8"),
+        "template_mtime_ns": TEMPLATE.stat().st_mtime_ns,
+    }
+    deadline = time.monotonic() + PANDOC_SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            pandoc_server_convert(server, {"text": "", "to": "html5"})
+            return server
+        except urllib.error.URLError as exc:
+            if not isinstance(exc.reason, ConnectionRefusedError):
+                break
+            time.sleep(0.05)
+        except (OSError, ValueError):
+            break
+
+    stop_pandoc_server(server)
+    return None
+
+
+def doc_pandoc_options(markdown: str) -> dict[str, object]:
+    """Enable the TOC and MathML only for docs that can use them.
+
+    Math is either `$` delimited or a raw LaTeX environment such as
+    \\begin{equation}, which Pandoc drops unless a math method is set. Docs
+    with neither, and without headings, render identically without these,
+    and Pandoc skips the TOC pass and MathML writer for them.
+    """
+    options: dict[str, object] = {}
+    if HEADING_HINT_RE.search(markdown):
+        options["table-of-contents"] = True
+    if "$" in markdown or "\\begin{" in markdown:
+        options["html-math-method"] = "mathml"
+    return options
+
+
+def run_pandoc_server(
+    server: dict[str, object],
+    markdown: str,
+    metadata: dict[str, str],
+    options: dict[str, object],
+) -> bytes:
+    payload = {
+        **PANDOC_OPTIONS,
+        **options,
+        "text": markdown,
+        "template": server["template"],
+        # Metadata values are Pandoc AST nodes; MetaString matches `--metadata k=v`.
+        "metadata": {
+            key: {"t": "MetaString", "c": value} for key, value in metadata.items()
+        },
+    }
+    try:
+        return pandoc_server_convert(server, payload)
+    except OSError as exc:
+        raise ValueError(f"pandoc server request failed: {exc}") from exc
+
+
+def start_pandoc() -> dict[str, object]:
+    """Start the Pandoc backend for a build: a shared server, else the plain CLI."""
+    server = start_pandoc_server()
+    if server is not None:
+        return server
+
+    print("pandoc server unavailable; running one pandoc process per doc.")
+    # Write the static options to a defaults file once per build, so each
+    # per-doc command line only carries the input and its metadata. JSON is
+    # valid YAML, so no YAML library is needed. Keep non-ASCII characters
+    # literal: libyaml rejects the surrogate-pair escapes json emits otherwise.
+    scratch_dir = Path(tempfile.mkdtemp(prefix="cabinet-build-"))
+    defaults = scratch_dir / "defaults.yaml"
+    defaults.write_text(
+        json.dumps(
+            {**PANDOC_OPTIONS, "template": str(TEMPLATE)},
+            indent=2,
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    return {"kind": "cli", "scratch_dir": scratch_dir, "defaults": defaults}
+
+
+def stop_pandoc(pandoc: dict[str, object]) -> None:
+    if pandoc["kind"] == "server":
+        stop_pandoc_server(pandoc)
+    else:
+        shutil.rmtree(str(pandoc["scratch_dir"]), ignore_errors=True)
+
+
+def run_pandoc_cli(
+    pandoc: dict[str, object],
+    markdown: str,
+    metadata: dict[str, str],
+    options: dict[str, object],
+) -> bytes:
+    # Stage the input in the build's scratch dir rather than next to the source,
+    # where it would show up as a doc change to --watch.
     temp_md_path: Path | None = None
     with tempfile.NamedTemporaryFile(
-        mode="w", encoding="utf-8", suffix=".md", dir=md_path.parent, delete=False
+        mode="w",
+        encoding="utf-8",
+        suffix=".md",
+        dir=str(pandoc["scratch_dir"]),
+        delete=False,
     ) as temp_md:
         temp_md.write(markdown)
         temp_md_path = Path(temp_md.name)
 
+    # Hand Pandoc the metadata as one JSON dict, the same one the server gets,
+    # rather than as --metadata argv pairs. It goes in a second defaults file,
+    # not --metadata-file, whose string values Pandoc would parse as markdown.
+    temp_meta_path: Path | None = None
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        encoding="utf-8",
+        suffix=".json",
+        dir=str(pandoc["scratch_dir"]),
+        delete=False,
+    ) as temp_meta:
+        json.dump({"metadata": metadata}, temp_meta, ensure_ascii=False)
+        temp_meta_path = Path(temp_meta.name)
+
     cmd = [
-        "pandoc", str(temp_md_path),
-        # Some dossier docs intentionally omit a blank line before list items.
-        # Enable this extension so bullets render as lists instead of inline text.
-        "--from=markdown+lists_without_preceding_blankline",
-        "--to=html5",
-        "--standalone",
-        "--wrap=none",
-        f"--template={TEMPLATE}",
-        "--toc",
-        "--toc-depth=3",
-        "--mathml",
-        "--metadata", "lang=en",
-        "--metadata", f"pagetitle={entry['title']} | SPECTER Labs",
-        "--metadata", f"slug={slug}",
-        "--metadata", f"doc_id={entry['doc_id']}",
-        "--metadata", f"dossier={dossier_display}",
-        "--metadata", f"root_prefix={root_prefix}",
-        "--metadata", f"source_path={source_path}",
-        "--metadata", f"built_at={built_at}",
+        "pandoc",
+        str(temp_md_path),
+        f"--defaults={pandoc['defaults']}",
+        f"--defaults={temp_meta_path}",
     ]
-
-    if entry["category"]:
-        cmd.extend(["--metadata", f"category={entry['category']}"])
+    if options.get("table-of-contents"):
+        cmd.append("--toc")
+    if options.get("html-math-method") == "mathml":
+        cmd.append("--mathml")
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Keep stdout as bytes: the page is written out as-is, so decoding it
+        # here would only be undone by the encode on write.
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     finally:
-        if temp_md_path is not None and temp_md_path.exists():
-            temp_md_path.unlink()
+        for temp_path in (temp_md_path, temp_meta_path):
+            if temp_path is not None and temp_path.exists():
+                temp_path.unlink()
 
     if result.returncode != 0:
-        print(f"FAIL {md_path}: {result.stderr.strip()}", file=sys.stderr)
-        sys.exit(1)
+        raise ValueError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout
+
+
+def load_build_cache() -> dict[str, dict[str, str]]:
+    """Return {source_path: {digest, built_at}} from the last build, if usable."""
+    try:
+        raw = json.loads(BUILD_CACHE.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != BUILD_CACHE_VERSION:
+        return {}
+    docs = raw.get("docs")
+    if not isinstance(docs, dict):
+        return {}
+    return {
+        path: record
+        for path, record in docs.items()
+        if isinstance(record, dict)
+        and isinstance(record.get("digest"), str)
+        and isinstance(record.get("built_at"), str)
+    }
+
+
+def save_build_cache(docs: dict[str, dict[str, str]]) -> None:
+    payload = json.dumps(
+        {"version": BUILD_CACHE_VERSION, "docs": docs}, indent=2, sort_keys=True
+    ) + "\n"
+    if BUILD_CACHE.is_file() and BUILD_CACHE.read_text(encoding="utf-8") == payload:
+        return
+    BUILD_CACHE.write_text(payload, encoding="utf-8")
+
+
+def pandoc_version(pandoc_path: str) -> bytes:
+    """Return `pandoc --version` output for the pandoc at pandoc_path."""
+    return pandoc_version_cached(pandoc_path, Path(pandoc_path).stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=None)
+def pandoc_version_cached(pandoc_path: str, mtime_ns: int) -> bytes:
+    # mtime_ns only keys the cache, so an upgraded binary is asked again.
+    result = subprocess.run(
+        [pandoc_path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    return result.stdout
+
+
+def build_inputs_digest(pandoc_path: str) -> str:
+    """Digest the inputs shared by every page: Pandoc, the template and this script."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pandoc_version(pandoc_path))
+    digest.update(b"\0")
+    digest.update(TEMPLATE.read_bytes())
+    digest.update(b"\0")
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def render_digest(entry: dict[str, str], inputs_digest: str) -> str:
+    """Digest everything that shapes a doc's page except its build timestamp."""
+    metadata = doc_metadata(entry, "")
+    del metadata["built_at"]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        inputs_digest,
+        json.dumps(metadata, sort_keys=True),
+        entry["render_markdown"],
+        entry["backlinks_html"],
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def render_doc(
+    entry: dict[str, str],
+    built_at: str,
+    pandoc: dict[str, object],
+    previous_built_at: str | None = None,
+) -> list[bytes] | None:
+    """Render a single markdown doc to HTML via Pandoc without writing it.
+
+    Returns the page as a list of byte chunks for write_page, or None when the
+    existing page already has the same content (ignoring the timestamp of the
+    build that wrote it) and should be left untouched.
+
+    Uses the shared `pandoc server` when that is the backend, else one Pandoc
+    process per doc. Raises ValueError on failure so callers running renders
+    concurrently can collect errors instead of exiting from a worker thread.
+    """
+    md_path = Path(entry["path"])
+    out_file = output_dir_for(entry["dossier"], entry["slug"]) / "index.html"
+
+    markdown = entry.get("render_markdown")
+    if not isinstance(markdown, str):
+        raise ValueError(f"missing transformed markdown for {entry['path']}")
 
-    if BACKLINKS_MARKER not in result.stdout:
-        print(
-            f"FAIL {md_path}: template missing backlinks marker ({BACKLINKS_MARKER})",
-            file=sys.stderr,
+    metadata = doc_metadata(entry, built_at)
+    options = doc_pandoc_options(markdown)
+    try:
+        if pandoc["kind"] == "server":
+            rendered = run_pandoc_server(pandoc, markdown, metadata, options)
+        else:
+            rendered = run_pandoc_cli(pandoc, markdown, metadata, options)
+    except ValueError as exc:
+        raise ValueError(f"{md_path}: {exc}") from exc
+
+    marker = BACKLINKS_MARKER.encode("utf-8")
+    if marker not in rendered:
+        raise ValueError(
+            f"{md_path}: template missing backlinks marker ({BACKLINKS_MARKER})"
         )
-        sys.exit(1)
 
-    backlinks_html = render_backlinks_html(entry, backlinks)
-    rendered_html = result.stdout.replace(BACKLINKS_MARKER, backlinks_html)
+    # Splice the backlinks in as separate chunks instead of copying the page.
+    backlinks_html = entry["backlinks_html"].encode("utf-8")
+    chunks: list[bytes] = []
+    for piece in rendered.split(marker):
+        if chunks:
+            chunks.append(backlinks_html)
+        chunks.append(piece)
+
+    if previous_built_at is not None and out_file.is_file():
+        existing = out_file.read_bytes()
+        existing = existing.replace(
+            previous_built_at.encode("utf-8"), built_at.encode("utf-8")
+        )
+        if same_content(existing, chunks):
+            return None
+
+    return chunks
+
+
+def same_content(existing: bytes, chunks: list[bytes]) -> bool:
+    if len(existing) != sum(len(chunk) for chunk in chunks):
+        return False
+    view = memoryview(existing)
+    offset = 0
+    for chunk in chunks:
+        if view[offset:offset + len(chunk)] != chunk:
+            return False
+        offset += len(chunk)
+    return True
 
-    out_file.write_text(rendered_html, encoding="utf-8")
-    print(f"  {out_file.relative_to(SITE_ROOT)}")
+
+def write_page(out_file: Path, chunks: list[bytes]) -> None:
+    """Write a page's chunks with one writev call, looping on short writes."""
+    fd = os.open(out_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        pending = [memoryview(chunk) for chunk in chunks if chunk]
+        while pending:
+            written = os.writev(fd, pending)
+            while pending and written >= len(pending[0]):
+                written -= len(pending[0])
+                pending.pop(0)
+            if pending and written:
+                pending[0] = pending[0][written:]
+    finally:
+        os.close(fd)
 
 
 def build_index(dossiers: dict[str, list[dict[str, str]]]) -> None:
     """Generate the cabinet index page from the template."""
-    template = INDEX_TEMPLATE.read_text(encoding="utf-8")
+    template_head, marker, template_tail = INDEX_TEMPLATE.read_text(
+        encoding="utf-8"
+    ).partition("<!-- DRAWERS -->")
 
-    drawers_html = []
+    # Append every fragment to one flat list and join once, rather than building
+    # per-item and per-drawer strings that are immediately copied again.
+    parts: list[str] = []
     for dossier in sorted(dossiers.keys()):
         entries = dossiers[dossier]
         display = DISPLAY_NAMES.get(dossier, dossier.replace("-", " ").title())
-        entries_sorted = sorted(entries, key=entry_sort_key)
-
-        items_html = []
-        for entry in entries_sorted:
+        if parts:
+            parts.append("\n")
+        parts.extend((
+            '<div class="cabinet-drawer">',
+            '<div class="drawer-tab">',
+            html.escape(display),
+            f'<span class="drawer-tab-count">{len(entries)}</span>',
+            "</div>",
+            '<div class="drawer-body">',
+        ))
+        for entry in entries:
             href = f"{dossier}/{entry['slug']}/"
-            doc_id = html.escape(entry["doc_id"])
-            cat_span = ""
+            parts.extend((
+                '<a class="drawer-item" href="', html.escape(href), '">',
+                '<span class="drawer-item-id">', entry["doc_id"], "</span>",
+                '<span class="drawer-item-title">', html.escape(entry["title"]), "</span>",
+            ))
             if entry["category"]:
-                cat_span = (
-                    f'<span class="drawer-item-category">'
-                    f'{html.escape(entry["category"])}</span>'
-                )
-            items_html.append(
-                f'<a class="drawer-item" href="{html.escape(href)}">'
-                f'<span class="drawer-item-id">{doc_id}</span>'
-                f'<span class="drawer-item-title">'
-                f'{html.escape(entry["title"])}</span>'
-                f'{cat_span}'
-                f"</a>"
-            )
-
-        drawer = (
-            f'<div class="cabinet-drawer">'
-            f'<div class="drawer-tab">'
-            f'{html.escape(display)}'
-            f'<span class="drawer-tab-count">{len(entries)}</span>'
-            f"</div>"
-            f'<div class="drawer-body">'
-            f"{''.join(items_html)}"
-            f"</div></div>"
-        )
-        drawers_html.append(drawer)
-
-    index_html = template.replace("<!-- DRAWERS -->", "\n".join(drawers_html))
+                parts.extend((
+                    '<span class="drawer-item-category">',
+                    escape_category(entry["category"]),
+                    "</span>",
+                ))
+            parts.append("</a>")
+        parts.append("</div></div>")
+
+    # Stream head, drawers and tail instead of splicing them into one more
+    # full-size copy of the page.
     out = CABINET_DIR / "index.html"
-    out.write_text(index_html, encoding="utf-8")
+    with out.open("w", encoding="utf-8") as f:
+        f.write(template_head)
+        if marker:
+            f.writelines(parts)
+        f.write(template_tail)
     print(f"  {out.relative_to(SITE_ROOT)}")
 
 
 def clean_generated() -> None:
     """Remove previously generated dossier subdirectories under cabinet/."""
+    # rmtree is one unlink per file; dossier trees are independent, so remove
+    # them concurrently.
+    generated = [child for child in CABINET_DIR.iterdir() if child.is_dir()]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(shutil.rmtree, generated))
+
+
+def prune_stale_outputs(dossiers: dict[str, list[dict[str, str]]]) -> None:
+    """Remove generated pages whose source doc or dossier no longer exists."""
+    expected = {
+        output_dir_for(dossier, entry["slug"])
+        for dossier, entries in dossiers.items()
+        for entry in entries
+    }
     for child in CABINET_DIR.iterdir():
-        if child.is_dir() and child.name not in {".", ".."}:
+        if not child.is_dir():
+            continue
+        if child.name not in dossiers:
             shutil.rmtree(child)
+            print(f"  removed {child.relative_to(SITE_ROOT)}/")
+            continue
 
-
-def main() -> None:
-    if not shutil.which("pandoc"):
+        # Slug dirs can nest (a doc and a category share a name), so drop stale
+        # pages file by file and then prune whatever directories became empty.
+        for dirpath, _, filenames in os.walk(child, topdown=False):
+            current = Path(dirpath)
+            if "index.html" in filenames and current not in expected:
+                stale = current / "index.html"
+                stale.unlink()
+                print(f"  removed {stale.relative_to(SITE_ROOT)}")
+            if not os.listdir(current):
+                current.rmdir()
+
+
+def ensure_pandoc(state: dict[str, object]) -> dict[str, object]:
+    """Return the Pandoc backend kept in state, starting it on first use."""
+    pandoc = state.get("pandoc")
+    if isinstance(pandoc, dict) and pandoc["kind"] == "server":
+        process = pandoc["process"]
+        if isinstance(process, subprocess.Popen) and process.poll() is not None:
+            # The server died between builds; start a fresh backend.
+            stop_pandoc(pandoc)
+            pandoc = None
+        elif pandoc["template_mtime_ns"] != TEMPLATE.stat().st_mtime_ns:
+            # Server requests carry the template text, so pick up edits to it.
+            pandoc["template"] = TEMPLATE.read_text(encoding="utf-8")
+            pandoc["template_mtime_ns"] = TEMPLATE.stat().st_mtime_ns
+
+    if not isinstance(pandoc, dict):
+        pandoc = start_pandoc()
+        state["pandoc"] = pandoc
+    return pandoc
+
+
+def build_once(state: dict[str, object], clean: bool = False) -> int:
+    """Run one cabinet build and return its exit status.
+
+    state persists across builds in watch mode: the pandoc lookup, the running
+    Pandoc backend and the build cache are set up once and reused.
+    """
+    # Only remember a successful lookup, so a watch session picks up a pandoc
+    # installed after it started.
+    pandoc_path = state.get("pandoc_path") or shutil.which("pandoc")
+    if not pandoc_path:
         print("pandoc not found. Install pandoc >= 3.x.", file=sys.stderr)
-        sys.exit(1)
+        return 1
+    state["pandoc_path"] = pandoc_path
 
     if not TEMPLATE.is_file():
         print(f"Missing template: {TEMPLATE}", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     dossiers = find_docs()
     if not dossiers:
         print("No docs found in dossiers/*/docs/.", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     try:
         registry = load_doc_id_registry()
         assign_doc_ids(dossiers, registry)
     except ValueError as exc:
         print(f"Invalid registry at {DOC_ID_MAP}: {exc}", file=sys.stderr)
-        sys.exit(1)
+        return 1
     save_doc_id_registry(registry)
 
     try:
@@ -854,7 +1316,7 @@ def main() -> None:
         backlinks = build_backlink_graph(dossiers, lookup)
     except ValueError as exc:
         print(f"Link graph error: {exc}", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     built_at = (
         datetime.now(timezone.utc)
@@ -866,15 +1328,196 @@ def main() -> None:
     total = sum(len(v) for v in dossiers.values())
     print(f"Cabinet: {total} docs across {len(dossiers)} dossiers")
 
-    clean_generated()
+    if clean:
+        clean_generated()
+    else:
+        prune_stale_outputs(dossiers)
 
-    for dossier, entries in sorted(dossiers.items()):
-        print(f"[{dossier}]")
+    # Only re-render docs whose inputs changed since the last build. The digest
+    # covers the transformed markdown (which embeds linked doc titles), the
+    # backlinks, the metadata, the template and this script.
+    if clean:
+        build_cache = {}
+    else:
+        build_cache = state.get("build_cache")
+        if not isinstance(build_cache, dict):
+            build_cache = load_build_cache()
+    next_build_cache: dict[str, dict[str, str]] = {}
+    inputs_digest = build_inputs_digest(pandoc_path)
+    tasks: list[dict[str, str]] = []
+    for _, entries in sorted(dossiers.items()):
         for entry in entries:
-            render_doc(entry, built_at, backlinks)
+            entry["backlinks_html"] = render_backlinks_html(entry, backlinks)
+            entry["render_digest"] = render_digest(entry, inputs_digest)
+            cached = build_cache.get(repo_relative_path(entry))
+            out_file = output_dir_for(entry["dossier"], entry["slug"]) / "index.html"
+            if (
+                cached is not None
+                and cached["digest"] == entry["render_digest"]
+                and out_file.is_file()
+            ):
+                next_build_cache[repo_relative_path(entry)] = cached
+                continue
+            tasks.append(entry)
+    up_to_date = total - len(tasks)
+
+    # Create the output tree once up front. Sorting puts parents before children,
+    # so most directories cost a single mkdir instead of a walk up the ancestors.
+    out_dirs = {output_dir_for(entry["dossier"], entry["slug"]) for entry in tasks}
+    for out_dir in sorted(out_dirs):
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Prefer one long-lived `pandoc server`: it avoids paying Pandoc's startup
+    # cost per doc. The caller stops it once it is done building.
+    pandoc = ensure_pandoc(state) if tasks else None
+
+    # Each render is an independent Pandoc call, so threads are enough to keep
+    # every core busy. Results are reported in submission order to keep the
+    # build log deterministic.
+    failures: list[str] = []
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = []
+            for entry in tasks:
+                cached = build_cache.get(repo_relative_path(entry))
+                previous_built_at = cached["built_at"] if cached else None
+                futures.append(
+                    executor.submit(
+                        render_doc, entry, built_at, pandoc, previous_built_at
+                    )
+                )
+            pending_writes: list[tuple[dict[str, str], list[bytes]]] = []
+            for entry, future in zip(tasks, futures):
+                try:
+                    chunks = future.result()
+                except ValueError as exc:
+                    failures.append(str(exc))
+                    continue
+
+                if chunks is None:
+                    # Unchanged page: keep the timestamp of the build that wrote it.
+                    key = repo_relative_path(entry)
+                    next_build_cache[key] = {
+                        "digest": entry["render_digest"],
+                        "built_at": build_cache[key]["built_at"],
+                    }
+                    up_to_date += 1
+                    continue
+                pending_writes.append((entry, chunks))
+
+        # Write pages in one pass once rendering is done, rather than
+        # interleaving small writes with the renders.
+        current_dossier = None
+        for entry, chunks in pending_writes:
+            out_file = output_dir_for(entry["dossier"], entry["slug"]) / "index.html"
+            write_page(out_file, chunks)
+            next_build_cache[repo_relative_path(entry)] = {
+                "digest": entry["render_digest"],
+                "built_at": built_at,
+            }
+            if entry["dossier"] != current_dossier:
+                current_dossier = entry["dossier"]
+                print(f"[{current_dossier}]")
+            print(f"  {out_file.relative_to(SITE_ROOT)}")
+    finally:
+        state["build_cache"] = next_build_cache
+        save_build_cache(next_build_cache)
+
+    if up_to_date:
+        print(f"  {up_to_date} docs up to date")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+        return 1
 
     build_index(dossiers)
     print("Done.")
+    return 0
+
+
+def watch(state: dict[str, object]) -> None:
+    """Rebuild whenever a dossier doc or cabinet template changes, until Ctrl-C.
+
+    Every rebuild reruns discovery and the link graph, which are cheap; the
+    build cache keeps Pandoc work down to the docs an edit actually touched.
+    """
+    # Optional dependency, only needed for --watch; main checks it is installed.
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    templates = {str(TEMPLATE), str(INDEX_TEMPLATE)}
+    changed = threading.Event()
+
+    class ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            # Builds read every doc, so ignore open/close events.
+            if event.event_type not in {"created", "modified", "deleted", "moved"}:
+                return
+            paths = [str(event.src_path), str(getattr(event, "dest_path", ""))]
+            if any(path.endswith(".md") or path in templates for path in paths):
+                changed.set()
+
+    observer = Observer()
+    handler = ChangeHandler()
+    for root in DOSSIER_ROOTS:
+        if root.is_dir():
+            observer.schedule(handler, str(root), recursive=True)
+    # Pages are written below CABINET_DIR, so only watch its top level.
+    observer.schedule(handler, str(CABINET_DIR), recursive=False)
+    observer.start()
+
+    print("Watching for changes (Ctrl-C to stop)...")
+    try:
+        while True:
+            changed.wait()
+            # Let a burst of editor writes settle into a single rebuild.
+            time.sleep(WATCH_DEBOUNCE)
+            changed.clear()
+            try:
+                build_once(state)
+            except (OSError, UnicodeDecodeError) as exc:
+                # Docs can vanish or be half-written mid-save; the next
+                # change event triggers another rebuild.
+                print(f"Rebuild failed: {exc}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Remove all generated pages and re-render every doc.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep rebuilding on doc or template changes (needs watchdog).",
+    )
+    args = parser.parse_args()
+
+    if args.watch and importlib.util.find_spec("watchdog") is None:
+        print("--watch needs the watchdog package: pip install watchdog", file=sys.stderr)
+        sys.exit(1)
+
+    # Turn SIGTERM into a normal exit so the finally below stops pandoc server.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    state: dict[str, object] = {}
+    try:
+        status = build_once(state, clean=args.clean)
+        if args.watch:
+            watch(state)
+    finally:
+        pandoc = state.get("pandoc")
+        if isinstance(pandoc, dict):
+            stop_pandoc(pandoc)
+    sys.exit(status)
 
 
 if __name__ == "__main__":